@@ -11,6 +11,7 @@ Introduction
 
 Address specific functions used in this frontier version of specification.
 """
+from functools import lru_cache
 from typing import Union
 
 from ethereum.base_types import U256, Uint
@@ -33,13 +34,17 @@ def to_address(data: Union[Uint, U256]) -> Address:
     address : `Address`
         The obtained address.
     """
-    return data.to_be_bytes32()[-20:]
+    return data.to_bytes(32, "big")[-20:]
 
 
+@lru_cache(maxsize=1024)
 def compute_contract_address(address: Address, nonce: Uint) -> Address:
     """
     Computes address of the new account that needs to be created.
 
+    The address only depends on `address` and `nonce`, so it is memoized to
+    avoid repeating the RLP encoding and hashing for the same pair.
+
     Parameters
     ----------
     address :
@@ -24,6 +24,8 @@ from ..state import State
 
 __all__ = ("Environment", "Evm", "Message")
 
+STACK_DEPTH_LIMIT = U256(1024)
+
 
 @dataclass
 class Environment:
@@ -11,6 +11,10 @@ Introduction
 
 EVM gas constants and calculators.
 """
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Tuple
+
 from ethereum.base_types import U256, Uint
 from ethereum.frontier.eth_types import Address
 from ethereum.frontier.state import State, account_exists
@@ -46,6 +50,21 @@ GAS_CALL_VALUE = U256(9000)
 GAS_CALL_STIPEND = U256(2300)
 
 
+@dataclass
+class ExtendMemory:
+    """
+    The gas cost and size of a memory extension.
+
+    `cost`: `ethereum.base_types.U256`
+        The gas required to extend the memory.
+    `expand_by`: `ethereum.base_types.Uint`
+        The number of bytes by which the memory will be extended.
+    """
+
+    cost: U256
+    expand_by: Uint
+
+
 def subtract_gas(gas_left: U256, amount: U256) -> U256:
     """
     Subtracts `amount` from `gas_left`.
@@ -68,12 +87,17 @@ def subtract_gas(gas_left: U256, amount: U256) -> U256:
     return gas_left - amount
 
 
+@lru_cache(maxsize=4096)
 def calculate_memory_gas_cost(size_in_bytes: Uint) -> U256:
     """
     Calculates the gas cost for allocating memory
     to the smallest multiple of 32 bytes,
     such that the allocated size is at least as big as the given size.
 
+    The result only depends on `size_in_bytes`, so it is memoized: every
+    memory access recomputes the cost of the memory that is already
+    allocated.
+
     Parameters
     ----------
     size_in_bytes :
@@ -126,6 +150,44 @@ def calculate_gas_extend_memory(
     return to_be_paid
 
 
+def calculate_memory_extension(
+    memory: bytearray, extensions: List[Tuple[Uint, U256]]
+) -> ExtendMemory:
+    """
+    Calculates the gas amount and the number of bytes needed to extend memory
+    so that it covers every region in `extensions`.
+
+    Parameters
+    ----------
+    memory :
+        Memory contents of the EVM.
+    extensions:
+        List of `(start_position, size)` regions that need to be accessible.
+
+    Returns
+    -------
+    extend_memory : `ExtendMemory`
+        The gas to be paid for the extension and the number of bytes to
+        append to `memory`. Regions of size `0` are ignored.
+    """
+    size_to_extend = Uint(0)
+    to_be_paid = U256(0)
+    current_size = Uint(len(memory))
+    for start_position, size in extensions:
+        if size == 0:
+            continue
+        before_size = ceil32(current_size)
+        after_size = ceil32(start_position + size)
+        if after_size <= before_size:
+            continue
+        size_to_extend += after_size - current_size
+        already_paid = calculate_memory_gas_cost(before_size)
+        total_cost = calculate_memory_gas_cost(after_size)
+        to_be_paid += total_cost - already_paid
+        current_size = after_size
+    return ExtendMemory(to_be_paid, size_to_extend)
+
+
 def calculate_call_gas_cost(
     state: State, gas: U256, to: Address, value: U256
 ) -> U256:
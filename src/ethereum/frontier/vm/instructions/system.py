@@ -11,21 +11,29 @@ Introduction
 
 Implementations of the EVM system related instructions.
 """
+from typing import TYPE_CHECKING
+
 from ethereum.base_types import U256, Uint
 
+from ...eth_types import Address
 from ...state import get_account, increment_nonce
 from ...utils.address import compute_contract_address, to_address
-from .. import Evm, Message
+from .. import STACK_DEPTH_LIMIT, Evm, Message
 from ..gas import (
     GAS_CREATE,
     GAS_ZERO,
     calculate_call_gas_cost,
-    calculate_gas_extend_memory,
+    calculate_memory_extension,
     calculate_message_call_gas_stipend,
     subtract_gas,
 )
-from ..memory import extend_memory, memory_read_bytes, memory_write
-from ..stack import pop, push
+from ..memory import memory_read_bytes, memory_write
+from ..stack import pop, pop_n, push
+
+if TYPE_CHECKING:
+    # Importing the interpreter here at runtime would be circular, so it
+    # assigns these itself once it has been loaded.
+    from ..interpreter import process_create_message, process_message
 
 
 def create(evm: Evm) -> None:
@@ -37,26 +45,25 @@ def create(evm: Evm) -> None:
     evm :
         The current EVM frame.
     """
-    # This import causes a circular import error
-    # if it's not moved inside this method
-    from ...vm.interpreter import STACK_DEPTH_LIMIT, process_create_message
-
-    endowment = pop(evm.stack)
-    memory_start_position = Uint(pop(evm.stack))
-    memory_size = pop(evm.stack)
+    endowment, memory_start_word, memory_size = pop_n(evm.stack, 3)
+    memory_start_position = Uint(memory_start_word)
 
-    gas_cost = GAS_CREATE + calculate_gas_extend_memory(
-        evm.memory, memory_start_position, memory_size
+    extend_memory = calculate_memory_extension(
+        evm.memory, [(memory_start_position, memory_size)]
     )
+    gas_cost = GAS_CREATE + extend_memory.cost
     evm.gas_left = subtract_gas(evm.gas_left, gas_cost)
-    extend_memory(evm.memory, memory_start_position, memory_size)
+    evm.memory += b"\x00" * extend_memory.expand_by
+    state = evm.env.state
+    current_target = evm.message.current_target
     sender_address = evm.env.origin
-    sender = get_account(evm.env.state, sender_address)
+    sender = get_account(state, sender_address)
     if sender.balance < endowment:
         push(evm.stack, U256(0))
         return None
 
-    if evm.message.depth + 1 > STACK_DEPTH_LIMIT:
+    child_depth = evm.message.depth + 1
+    if child_depth > STACK_DEPTH_LIMIT:
         push(evm.stack, U256(0))
         return None
 
@@ -64,24 +71,24 @@ def create(evm: Evm) -> None:
         evm.memory, memory_start_position, memory_size
     )
 
-    increment_nonce(evm.env.state, evm.message.current_target)
+    increment_nonce(state, current_target)
     contract_address = compute_contract_address(
-        evm.message.current_target,
-        get_account(evm.env.state, evm.message.current_target).nonce - U256(1),
+        current_target,
+        get_account(state, current_target).nonce - U256(1),
     )
 
     gas_left = evm.gas_left
-    evm.gas_left = subtract_gas(evm.gas_left, gas_left)
+    evm.gas_left = U256(0)
 
     child_message = Message(
-        caller=evm.message.current_target,
+        caller=current_target,
         target=b"",
         gas=gas_left,
         value=endowment,
         data=b"",
         code=call_data,
         current_target=contract_address,
-        depth=evm.message.depth + 1,
+        depth=child_depth,
     )
     child_evm = process_create_message(child_message, evm.env)
     push(evm.stack, U256.from_be_bytes(child_evm.message.current_target))
@@ -99,11 +106,12 @@ def return_(evm: Evm) -> None:
     """
     memory_start_position = Uint(pop(evm.stack))
     memory_size = pop(evm.stack)
-    gas_cost = GAS_ZERO + calculate_gas_extend_memory(
-        evm.memory, memory_start_position, memory_size
+    extend_memory = calculate_memory_extension(
+        evm.memory, [(memory_start_position, memory_size)]
     )
+    gas_cost = GAS_ZERO + extend_memory.cost
     evm.gas_left = subtract_gas(evm.gas_left, gas_cost)
-    extend_memory(evm.memory, memory_start_position, memory_size)
+    evm.memory += b"\x00" * extend_memory.expand_by
     evm.output = memory_read_bytes(
         evm.memory, memory_start_position, memory_size
     )
@@ -111,73 +119,87 @@ def return_(evm: Evm) -> None:
     evm.running = False
 
 
-def call(evm: Evm) -> None:
+def generic_call(
+    evm: Evm,
+    gas: U256,
+    value: U256,
+    to: Address,
+    code_address: Address,
+    memory_input_start_position: Uint,
+    memory_input_size: U256,
+    memory_output_start_position: Uint,
+    memory_output_size: U256,
+) -> None:
     """
-    Message-call into an account.
+    Perform the core logic of the `CALL*` family of opcodes.
 
     Parameters
     ----------
     evm :
         The current EVM frame.
+    gas :
+        The amount of gas provided to the message-call.
+    value :
+        The amount of `ETH` that needs to be transferred.
+    to :
+        The account whose context the child frame executes in.
+    code_address :
+        The account whose code the child frame executes.
+    memory_input_start_position :
+        Starting pointer of the call data in memory.
+    memory_input_size :
+        Size of the call data.
+    memory_output_start_position :
+        Starting pointer of the region the output is written to.
+    memory_output_size :
+        Size of the region the output is written to.
     """
-    from ethereum.frontier.vm.interpreter import (
-        STACK_DEPTH_LIMIT,
-        process_message,
-    )
-
-    gas = pop(evm.stack)
-    to = to_address(pop(evm.stack))
-    value = pop(evm.stack)
-    memory_input_start_position = Uint(pop(evm.stack))
-    memory_input_size = pop(evm.stack)
-    memory_output_start_position = Uint(pop(evm.stack))
-    memory_output_size = pop(evm.stack)
+    state = evm.env.state
+    current_target = evm.message.current_target
 
-    call_gas_fee = calculate_call_gas_cost(evm.env.state, gas, to, value)
+    call_gas_fee = calculate_call_gas_cost(state, gas, to, value)
     message_call_gas_fee = gas + calculate_message_call_gas_stipend(value)
 
     evm.gas_left = subtract_gas(evm.gas_left, call_gas_fee)
 
-    gas_input_memory = calculate_gas_extend_memory(
-        evm.memory, memory_input_start_position, memory_input_size
-    )
-    evm.gas_left = subtract_gas(evm.gas_left, gas_input_memory)
-    extend_memory(evm.memory, memory_input_start_position, memory_input_size)
-    gas_output_memory = calculate_gas_extend_memory(
-        evm.memory, memory_output_start_position, memory_output_size
+    extend_memory = calculate_memory_extension(
+        evm.memory,
+        [
+            (memory_input_start_position, memory_input_size),
+            (memory_output_start_position, memory_output_size),
+        ],
     )
-    evm.gas_left = subtract_gas(evm.gas_left, gas_output_memory)
-    extend_memory(evm.memory, memory_output_start_position, memory_output_size)
+    evm.gas_left = subtract_gas(evm.gas_left, extend_memory.cost)
+    evm.memory += b"\x00" * extend_memory.expand_by
     call_data = memory_read_bytes(
         evm.memory, memory_input_start_position, memory_input_size
     )
-    sender_balance = get_account(
-        evm.env.state, evm.message.current_target
-    ).balance
+    sender_balance = get_account(state, current_target).balance
     if sender_balance < value:
         push(evm.stack, U256(0))
         evm.gas_left += message_call_gas_fee
         return None
-    if evm.message.depth + 1 > STACK_DEPTH_LIMIT:
+    child_depth = evm.message.depth + 1
+    if child_depth > STACK_DEPTH_LIMIT:
         push(evm.stack, U256(0))
         evm.gas_left += message_call_gas_fee
         return None
 
-    code = get_account(evm.env.state, to).code
+    code = get_account(state, code_address).code
     child_message = Message(
-        caller=evm.message.current_target,
+        caller=current_target,
         target=to,
         gas=message_call_gas_fee,
         value=value,
         data=call_data,
         code=code,
         current_target=to,
-        depth=evm.message.depth + 1,
+        depth=child_depth,
     )
     child_evm = process_message(child_message, evm.env)
     # TODO: push 0 to stack if message call results in an error
     push(evm.stack, U256(1))
-    actual_output_size = min(memory_output_size, U256(len(child_evm.output)))
+    actual_output_size = min(memory_output_size, len(child_evm.output))
     memory_write(
         evm.memory,
         memory_output_start_position,
@@ -186,77 +208,67 @@ def call(evm: Evm) -> None:
     evm.gas_left += child_evm.gas_left
 
 
-def callcode(evm: Evm) -> None:
+def call(evm: Evm) -> None:
     """
-    Message-call into this account with alternative account’s code.
+    Message-call into an account.
 
     Parameters
     ----------
     evm :
         The current EVM frame.
     """
-    from ethereum.frontier.vm.interpreter import (
-        STACK_DEPTH_LIMIT,
-        process_message,
+    (
+        gas,
+        to_word,
+        value,
+        memory_input_start_word,
+        memory_input_size,
+        memory_output_start_word,
+        memory_output_size,
+    ) = pop_n(evm.stack, 7)
+    to = to_address(to_word)
+
+    generic_call(
+        evm,
+        gas,
+        value,
+        to,
+        to,
+        Uint(memory_input_start_word),
+        memory_input_size,
+        Uint(memory_output_start_word),
+        memory_output_size,
     )
 
-    gas = pop(evm.stack)
-    code_address = to_address(pop(evm.stack))
-    value = pop(evm.stack)
-    memory_input_start_position = Uint(pop(evm.stack))
-    memory_input_size = pop(evm.stack)
-    memory_output_start_position = Uint(pop(evm.stack))
-    memory_output_size = pop(evm.stack)
-    to = evm.message.current_target
-
-    call_gas_fee = calculate_call_gas_cost(evm.env.state, gas, to, value)
-    message_call_gas_fee = gas + calculate_message_call_gas_stipend(value)
-
-    evm.gas_left = subtract_gas(evm.gas_left, call_gas_fee)
 
-    gas_input_memory = calculate_gas_extend_memory(
-        evm.memory, memory_input_start_position, memory_input_size
-    )
-    evm.gas_left = subtract_gas(evm.gas_left, gas_input_memory)
-    extend_memory(evm.memory, memory_input_start_position, memory_input_size)
-    gas_output_memory = calculate_gas_extend_memory(
-        evm.memory, memory_output_start_position, memory_output_size
-    )
-    evm.gas_left = subtract_gas(evm.gas_left, gas_output_memory)
-    extend_memory(evm.memory, memory_output_start_position, memory_output_size)
-    call_data = memory_read_bytes(
-        evm.memory, memory_input_start_position, memory_input_size
-    )
-    sender_balance = get_account(
-        evm.env.state, evm.message.current_target
-    ).balance
-    if sender_balance < value:
-        push(evm.stack, U256(0))
-        evm.gas_left += message_call_gas_fee
-        return None
-    if evm.message.depth + 1 > STACK_DEPTH_LIMIT:
-        push(evm.stack, U256(0))
-        evm.gas_left += message_call_gas_fee
-        return None
+def callcode(evm: Evm) -> None:
+    """
+    Message-call into this account with alternative account’s code.
 
-    code = get_account(evm.env.state, code_address).code
-    child_message = Message(
-        caller=evm.message.current_target,
-        target=to,
-        gas=message_call_gas_fee,
-        value=value,
-        data=call_data,
-        code=code,
-        current_target=to,
-        depth=evm.message.depth + 1,
-    )
-    child_evm = process_message(child_message, evm.env)
-    # TODO: push 0 to stack if message call results in an error
-    push(evm.stack, U256(1))
-    actual_output_size = min(memory_output_size, U256(len(child_evm.output)))
-    memory_write(
-        evm.memory,
-        memory_output_start_position,
-        child_evm.output[:actual_output_size],
+    Parameters
+    ----------
+    evm :
+        The current EVM frame.
+    """
+    (
+        gas,
+        code_address_word,
+        value,
+        memory_input_start_word,
+        memory_input_size,
+        memory_output_start_word,
+        memory_output_size,
+    ) = pop_n(evm.stack, 7)
+    code_address = to_address(code_address_word)
+
+    generic_call(
+        evm,
+        gas,
+        value,
+        evm.message.current_target,
+        code_address,
+        Uint(memory_input_start_word),
+        memory_input_size,
+        Uint(memory_output_start_word),
+        memory_output_size,
     )
-    evm.gas_left += child_evm.gas_left
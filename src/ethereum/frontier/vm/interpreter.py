@@ -20,16 +20,14 @@ from ethereum.frontier.vm.error import InvalidOpcode, StackDepthLimitError
 from ethereum.frontier.vm.gas import GAS_CODE_DEPOSIT, subtract_gas
 
 from ..eth_types import Log
-from . import Environment, Evm
+from . import STACK_DEPTH_LIMIT, Environment, Evm
 from .instructions import Ops, op_implementation
+from .instructions import system as system_instructions
 from .runtime import get_valid_jump_destinations
 
 PC_CHANGING_OPS = {Ops.JUMP, Ops.JUMPI}
 
 
-STACK_DEPTH_LIMIT = U256(1024)
-
-
 def process_message_call(
     message: Message, env: Environment
 ) -> Tuple[U256, Tuple[Log, ...]]:
@@ -150,17 +148,23 @@ def execute_code(message: Message, env: Environment) -> Evm:
         message=message,
         output=b"",
     )
-    while evm.running and evm.pc < len(evm.code):
+    while evm.running and evm.pc < len(code):
         try:
-            op = Ops(evm.code[evm.pc])
+            op = Ops(code[evm.pc])
         except ValueError:
-            raise InvalidOpcode(evm.code[evm.pc])
+            raise InvalidOpcode(code[evm.pc])
 
         op_implementation[op](evm)
 
         if op not in PC_CHANGING_OPS:
             evm.pc += 1
 
-        if evm.pc >= len(evm.code):
+        if evm.pc >= len(code):
             evm.running = False
     return evm
+
+
+# The system instructions start child frames, but cannot import this module
+# themselves since it depends on them through `op_implementation`.
+system_instructions.process_message = process_message
+system_instructions.process_create_message = process_create_message
@@ -56,8 +56,7 @@ def memory_write(
     value :
         Data to write to memory.
     """
-    for idx, byte in enumerate(value):
-        memory[start_position + idx] = byte
+    memory[start_position : start_position + len(value)] = value
 
 
 def memory_read_bytes(
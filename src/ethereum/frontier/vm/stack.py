@@ -12,7 +12,7 @@ Introduction
 Implementation of the stack operators for the EVM.
 """
 
-from typing import List
+from typing import List, Tuple
 
 from ethereum.base_types import U256
 
@@ -44,6 +44,37 @@ def pop(stack: List[U256]) -> U256:
     return stack.pop()
 
 
+def pop_n(stack: List[U256], num_items: int) -> Tuple[U256, ...]:
+    """
+    Pops the top `num_items` items off of `stack`.
+
+    Parameters
+    ----------
+    stack :
+        EVM stack.
+
+    num_items :
+        Number of items to pop.
+
+    Returns
+    -------
+    values : `Tuple[U256, ...]`
+        The popped items, in the order `pop` would have returned them.
+
+    Raises
+    ------
+    StackUnderflowError
+        If `stack` has fewer than `num_items` items.
+    """
+    if len(stack) < num_items:
+        raise StackUnderflowError
+
+    split_index = len(stack) - num_items
+    values = tuple(reversed(stack[split_index:]))
+    del stack[split_index:]
+    return values
+
+
 def push(stack: List[U256], value: U256) -> None:
     """
     Pushes `value` onto `stack`.